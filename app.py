@@ -1,7 +1,10 @@
 import streamlit as st
-import requests
+import httpx
+import json
 import time
 import os
+import uuid
+from collections import deque
 
 # 🔁 Your Render backend URL here (DON'T use localhost)
 BACKEND_URL = "http://127.0.0.1:8000"
@@ -17,75 +20,118 @@ st.title("📅 AI Booking Agent")
 st.markdown("*Natural language appointment scheduling powered by AI*")
 
 # Initialize session state
+# Chat history is kept as (role, content) tuples; only the latest
+# MAX_HISTORY turns are retained
+MAX_HISTORY = 200
+
+GREETING = ("assistant", "Hello! I'm your AI booking assistant. I can help you schedule appointments, check availability, and manage your calendar. What would you like to do today?")
+
+ERROR_MSG = "Sorry, I'm having trouble connecting to my booking system. Please try again."
+
+def push_assistant(msg):
+    """Append an assistant message to the history"""
+    st.session_state.messages.append(("assistant", msg))
+
+def new_conversation_id():
+    """Collision-free id for a new backend conversation"""
+    return f"conv_{uuid.uuid4().hex}"
+
 if 'messages' not in st.session_state:
-    st.session_state.messages = [
-        {
-            "role": "assistant",
-            "content": "Hello! I'm your AI booking assistant. I can help you schedule appointments, check availability, and manage your calendar. What would you like to do today?"
-        }
-    ]
+    st.session_state.messages = deque([GREETING], maxlen=MAX_HISTORY)
 
 if 'conversation_id' not in st.session_state:
-    st.session_state.conversation_id = f"conv_{int(time.time())}"
-
-# Display chat messages
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
-
-# Chat input
-if prompt := st.chat_input("Type your message here..."):
-    # Add user message
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-
-    # Get response from backend
-    with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            try:
-                response = requests.post(
-                    f"{BACKEND_URL}/chat",
-                    json={
-                        "message": prompt,
-                        "conversation_id": st.session_state.conversation_id
-                    },
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    assistant_message = data.get("response", "I'm sorry, I couldn't process that request.")
-
-                    st.markdown(assistant_message)
-
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": assistant_message
-                    })
-
-                    # Booking info
-                    if data.get("booking_confirmed"):
-                        st.success("✅ Appointment booked successfully!")
-                        booking_details = data.get("booking_details", {})
-                        if booking_details:
-                            st.info(f"**Booking Details:**\n"
-                                    f"- Date: {booking_details.get('date', 'N/A')}\n"
-                                    f"- Time: {booking_details.get('time', 'N/A')}\n"
-                                    f"- Duration: {booking_details.get('duration', 'N/A')} minutes")
-                else:
-                    st.error("❌ Backend error. Please try again.")
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": "Sorry, I'm having trouble connecting to my booking system. Please try again."
-                    })
-
-            except requests.exceptions.RequestException as e:
-                st.error(f"❌ Failed to connect to backend: {e}")
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": "Sorry, I'm having trouble connecting to my booking system. Please try again."
-                })
+    st.session_state.conversation_id = new_conversation_id()
+
+@st.cache_resource
+def backend_client():
+    """
+    Process-wide HTTP client for the backend, so chat turns from every
+    session reuse warm keep-alive connections
+    """
+    return httpx.Client(
+        base_url=BACKEND_URL,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60)
+    )
+
+def stream_reply(response, meta):
+    """
+    Yield text chunks from the backend's event stream. The trailing
+    metadata frame (or an error frame) is stored in meta.
+    """
+    event = "message"
+    for line in response.iter_lines():
+        if not line:
+            event = "message"
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            payload = json.loads(line[len("data:"):])
+            if event == "message":
+                yield payload["delta"]
+            else:
+                meta[event] = payload
+
+def chat():
+    """
+    Chat history and input
+    """
+    # Display chat messages
+    for role, content in st.session_state.messages:
+        with st.chat_message(role):
+            st.markdown(content)
+
+    # Chat input
+    if prompt := st.chat_input("Type your message here..."):
+        # Add user message
+        st.session_state.messages.append(("user", prompt))
+        with st.chat_message("user"):
+            st.markdown(prompt)
+
+        # Get response from backend
+        with st.chat_message("assistant"):
+            with st.spinner("Thinking..."):
+                try:
+                    meta = {}
+                    with backend_client().stream(
+                        "POST",
+                        "/chat/stream",
+                        json={
+                            "message": prompt,
+                            "conversation_id": st.session_state.conversation_id
+                        },
+                        timeout=30
+                    ) as response:
+                        if response.status_code == 200:
+                            # Render the reply as it arrives instead of after the full round-trip
+                            assistant_message = st.write_stream(stream_reply(response, meta))
+
+                    if response.status_code == 200 and "error" not in meta:
+                        if not assistant_message:
+                            assistant_message = "I'm sorry, I couldn't process that request."
+                            st.markdown(assistant_message)
+
+                        push_assistant(assistant_message)
+
+                        data = meta.get("done", {})
+
+                        # Booking info
+                        if data.get("booking_confirmed"):
+                            st.success("✅ Appointment booked successfully!")
+                            booking_details = data.get("booking_details", {})
+                            if booking_details:
+                                st.info(f"**Booking Details:**\n"
+                                        f"- Date: {booking_details.get('date', 'N/A')}\n"
+                                        f"- Time: {booking_details.get('time', 'N/A')}\n"
+                                        f"- Duration: {booking_details.get('duration', 'N/A')} minutes")
+                    else:
+                        st.error("❌ Backend error. Please try again.")
+                        push_assistant(ERROR_MSG)
+
+                except httpx.HTTPError as e:
+                    st.error(f"❌ Failed to connect to backend: {e}")
+                    push_assistant(ERROR_MSG)
+
+chat()
 
 # Sidebar
 with st.sidebar:
@@ -106,11 +152,7 @@ with st.sidebar:
 
     st.header("🔄 Actions")
     if st.button("Clear Chat History"):
-        st.session_state.messages = [
-            {
-                "role": "assistant",
-                "content": "Hello! I'm your AI booking assistant. I can help you schedule appointments, check availability, and manage your calendar. What would you like to do today?"
-            }
-        ]
-        st.session_state.conversation_id = f"conv_{int(time.time())}"
+        st.session_state.messages.clear()
+        st.session_state.messages.append(GREETING)
+        st.session_state.conversation_id = new_conversation_id()
         st.rerun()
@@ -1,16 +1,49 @@
 import os
+import re
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import logging
-from openai import OpenAI
+from collections import OrderedDict
 
 from .calendar_service import calendar_service
 from .conversation_graph import ConversationGraph
 from .models import ConversationState, BookingRequest
+from ..utils.datetime_utils import parse_relative_date, parse_time_expression
 
 logger = logging.getLogger(__name__)
 
+# Keyword sets for intent analysis, matched against message tokens.
+# Tokens are whole words, so inflected forms are listed explicitly.
+_BOOK_KW = frozenset({
+    "book", "books", "booked", "booking", "bookings",
+    "schedule", "schedules", "scheduled", "scheduling",
+    "meeting", "meetings", "appointment", "appointments", "call", "calls",
+})
+_AVAILABILITY_KW = frozenset({"available", "availability", "free", "open", "opening", "openings"})
+_RESCHEDULE_KW = frozenset({
+    "cancel", "cancels", "cancelled", "canceled", "cancelling", "canceling", "cancellation",
+    "reschedule", "rescheduled", "rescheduling",
+    "change", "changes", "changed", "changing",
+})
+_CONFIRM_KW = frozenset({
+    "yes", "confirm", "confirmed", "ok", "okay", "sure", "works", "good", "fine",
+    "perfect", "great",
+})
+_DECLINE_KW = frozenset({"no", "nope", "not", "different", "another", "other"})
+_RELATIVE_DATE_KW = frozenset({
+    "tomorrow", "today", "monday", "tuesday", "wednesday", "thursday", "friday",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Duration mentions; digits that are part of a time such as "2:30" or "15:00" don't count
+_DURATION_RE = re.compile(r"(?<![:.])\b(15|fifteen|30|thirty|60|hours?)\b(?![:.]\d)")
+_DURATION_MINUTES = {
+    "15": 15, "fifteen": 15,
+    "30": 30, "thirty": 30,
+    "60": 60, "hour": 60, "hours": 60,
+}
+
 class BookingAgent:
     """
     Main booking agent that handles conversation flow and booking logic
@@ -20,8 +53,18 @@ class BookingAgent:
         # Initialize conversation graph
         self.conversation_graph = ConversationGraph()
         
-        # Store conversation states
-        self.conversations: Dict[str, ConversationState] = {}
+        # Store conversation states, evicting the least recently used
+        # conversation once the cap is reached
+        self.conversations: OrderedDict[str, ConversationState] = OrderedDict()
+        self._max_conversations = 10_000
+    
+    async def warmup(self):
+        """
+        Run a throwaway message through intent analysis, the conversation
+        graph and the calendar so first-use costs are paid at startup
+        """
+        await self.process_message("What's available tomorrow?", "_warmup")
+        self.conversations.pop("_warmup", None)
     
     def get_current_time(self) -> str:
         """Get current timestamp"""
@@ -32,17 +75,25 @@ class BookingAgent:
         Process a user message and return appropriate response
         """
         try:
+            # Read the clock once per message
+            now = datetime.now()
+            
             # Get or create conversation state
-            if conversation_id not in self.conversations:
-                self.conversations[conversation_id] = ConversationState(
-                    conversation_id=conversation_id
+            conversation = self.conversations.get(conversation_id)
+            if conversation is None:
+                conversation = ConversationState(
+                    conversation_id=conversation_id, created_at=now, updated_at=now
                 )
+                self.conversations[conversation_id] = conversation
+                if len(self.conversations) > self._max_conversations:
+                    self.conversations.popitem(last=False)
+            else:
+                self.conversations.move_to_end(conversation_id)
             
-            conversation = self.conversations[conversation_id]
-            conversation.updated_at = datetime.now()
+            conversation.updated_at = now
             
             # Analyze user intent and extract information
-            intent_analysis = await self._analyze_intent(message, conversation)
+            intent_analysis = await self._analyze_intent(message, conversation, now)
             
             # Update conversation state with extracted information
             conversation.user_intent = intent_analysis.get("intent")
@@ -78,38 +129,34 @@ class BookingAgent:
                 "booking_details": {}
             }
     
-    async def _analyze_intent(self, message: str, conversation: ConversationState) -> Dict[str, Any]:
+    async def _analyze_intent(self, message: str, conversation: ConversationState,
+                              now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Analyze user intent and extract relevant information using pattern matching
         """
         try:
-            # Import datetime utils for date parsing
-            import sys
-            import os
-            sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-            from utils.datetime_utils import parse_relative_date, parse_time_expression
-            
             message_lower = message.lower()
+            tokens = set(_TOKEN_RE.findall(message_lower))
             
             # Try to parse date and time from the message
-            parsed_date = parse_relative_date(message)
+            parsed_date = parse_relative_date(message, now)
             parsed_time = parse_time_expression(message)
             
             # Determine intent based on keywords and context
             intent = "general_query"
-            if any(word in message_lower for word in ["book", "schedule", "meeting", "appointment", "call"]):
+            if tokens & _BOOK_KW:
                 intent = "book_appointment"
-            elif any(word in message_lower for word in ["available", "availability", "free", "open"]):
+            elif tokens & _AVAILABILITY_KW:
                 intent = "check_availability"
-            elif any(word in message_lower for word in ["cancel", "reschedule", "change"]):
+            elif tokens & _RESCHEDULE_KW:
                 intent = "reschedule"
-            elif any(word in message_lower for word in ["yes", "confirm", "ok", "sure", "works", "good", "fine", "perfect", "great"]):
+            elif tokens & _CONFIRM_KW:
                 # Check if this is a confirmation in context
                 if conversation.current_node == "confirm_booking" or conversation.pending_confirmation:
                     intent = "confirm"
                 else:
                     intent = "book_appointment"
-            elif any(word in message_lower for word in ["no", "not", "different", "another", "other"]):
+            elif tokens & _DECLINE_KW:
                 intent = "decline"
             
             # If we have extracted date/time info, it's likely a booking intent
@@ -120,28 +167,23 @@ class BookingAgent:
             time_preference = "flexible"
             if parsed_time:
                 time_preference = "specific"
-            elif any(word in message_lower for word in ["morning"]):
+            elif "morning" in tokens:
                 time_preference = "morning"
-            elif any(word in message_lower for word in ["afternoon"]):
+            elif "afternoon" in tokens:
                 time_preference = "afternoon"
-            elif any(word in message_lower for word in ["evening"]):
+            elif "evening" in tokens:
                 time_preference = "evening"
             
             # Determine date preference
             date_preference = "flexible"
             if parsed_date:
                 date_preference = "specific"
-            elif any(word in message_lower for word in ["tomorrow", "today", "monday", "tuesday", "wednesday", "thursday", "friday"]):
+            elif tokens & _RELATIVE_DATE_KW:
                 date_preference = "relative"
             
             # Extract duration
-            duration = 30
-            if "30" in message or "thirty" in message_lower:
-                duration = 30
-            elif "60" in message or "hour" in message_lower:
-                duration = 60
-            elif "15" in message or "fifteen" in message_lower:
-                duration = 15
+            duration_match = _DURATION_RE.search(message_lower)
+            duration = _DURATION_MINUTES[duration_match.group(1)] if duration_match else 30
             
             result = {
                 "intent": intent,
@@ -196,6 +238,7 @@ class BookingAgent:
             result = await calendar_service.book_appointment(booking)
             
             if result["success"]:
+                self.conversation_graph.invalidate_availability(booking.date)
                 return {
                     "success": True,
                     "details": {
@@ -1,10 +1,50 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta, time
+import asyncio
+import bisect
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
 import logging
 from .models import TimeSlot, BookingRequest
 
 logger = logging.getLogger(__name__)
 
+# A booking stored as (start_minute, end_minute, title, description)
+Booking = Tuple[int, int, Optional[str], Optional[str]]
+
+_booking_start = itemgetter(0)
+
+# Suggestion buckets, in minutes after midnight
+_NOON_MIN = 12 * 60
+_AFTERNOON_END_MIN = 17 * 60
+
+# Business days looked up concurrently per suggestion batch; a day
+# yields at most two suggestions, so three days usually fill the list
+_SUGGESTION_BATCH_DAYS = 3
+
+def _free_slots(slot_starts: List[Tuple[int, str]], business_end: int, duration: int,
+                bookings: List[Booking]) -> List[Tuple[int, str]]:
+    """
+    Return the (start_minute, "HH:MM") slot starts whose slot fits before
+    business_end and doesn't overlap any booking. Bookings must be sorted
+    by start and non-overlapping, which book_appointment guarantees.
+    """
+    free = []
+    for slot in slot_starts:
+        start = slot[0]
+        end = start + duration
+        if end > business_end:
+            break
+        idx = bisect.bisect_right(bookings, start, key=_booking_start)
+        # Only the last booking starting at or before the slot and the first
+        # one starting after it can overlap
+        if idx and bookings[idx - 1][1] > start:
+            continue
+        if idx < len(bookings) and bookings[idx][0] < end:
+            continue
+        free.append(slot)
+    return free
+
 class MockCalendarService:
     """
     Mock calendar service that simulates Google Calendar functionality.
@@ -12,74 +52,95 @@ class MockCalendarService:
     """
     
     def __init__(self):
-        # Mock existing bookings for demonstration
-        self.existing_bookings = {
+        # Mock existing bookings for demonstration, times in minutes after
+        # midnight; each day's list is kept sorted by start time
+        self.existing_bookings: Dict[str, List[Booking]] = {
             "2025-06-27": [
-                {"start": "09:00", "end": "10:00", "title": "Team Meeting"},
-                {"start": "14:00", "end": "15:30", "title": "Client Call"},
+                (9 * 60, 10 * 60, "Team Meeting", None),
+                (14 * 60, 15 * 60 + 30, "Client Call", None),
             ],
             "2025-06-28": [
-                {"start": "11:00", "end": "12:00", "title": "Project Review"},
-                {"start": "16:00", "end": "17:00", "title": "One-on-One"},
+                (11 * 60, 12 * 60, "Project Review", None),
+                (16 * 60, 17 * 60, "One-on-One", None),
             ],
             "2025-06-30": [
-                {"start": "10:00", "end": "11:00", "title": "Stand-up"},
-                {"start": "15:00", "end": "16:00", "title": "Planning"},
+                (10 * 60, 11 * 60, "Stand-up", None),
+                (15 * 60, 16 * 60, "Planning", None),
             ]
         }
         
-        # Business hours configuration
-        self.business_start = time(9, 0)  # 9:00 AM
-        self.business_end = time(17, 0)   # 5:00 PM
+        # Business hours configuration, in minutes after midnight
+        self._business_start_min = 9 * 60  # 9:00 AM
+        self._business_end_min = 17 * 60   # 5:00 PM
         self.slot_duration = 30  # 30 minutes default
+        
+        # Slot start times are the same for every date, so build the
+        # (start_minute, "HH:MM") table once
+        self._slot_starts = [
+            (start, self._fmt(start))
+            for start in range(self._business_start_min, self._business_end_min, self.slot_duration)
+        ]
+        
+        # Availability memo keyed by (date, duration); flushed whenever
+        # _version (bumped on every booking) moves past _avail_cache_version,
+        # and capped at _max_avail_cache entries, least recently used first
+        self._version = 0
+        self._avail_cache: OrderedDict[Tuple[str, int], List[TimeSlot]] = OrderedDict()
+        self._avail_cache_version = 0
+        self._max_avail_cache = 1024
     
-    async def get_availability(self, date: str, duration: int = 30) -> List[TimeSlot]:
+    @staticmethod
+    def _fmt(minutes: int) -> str:
+        """Format minutes after midnight as HH:MM"""
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+    
+    async def get_availability(self, date: str, duration: int = 30,
+                               now: Optional[datetime] = None) -> List[TimeSlot]:
         """
-        Get available time slots for a given date
+        Get available time slots for a given date. Callers that already read
+        the clock can pass it as now.
         """
         try:
             date_obj = datetime.strptime(date, "%Y-%m-%d").date()
             
             # Don't show availability for past dates
-            if date_obj < datetime.now().date():
+            if date_obj < (now or datetime.now()).date():
                 return []
             
             # Skip weekends for simplicity
             if date_obj.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
                 return []
             
-            existing_bookings = self.existing_bookings.get(date, [])
-            available_slots = []
+            if self._avail_cache_version != self._version:
+                self._avail_cache.clear()
+                self._avail_cache_version = self._version
             
-            # Generate time slots from business hours
-            current_time = datetime.combine(date_obj, self.business_start)
-            end_time = datetime.combine(date_obj, self.business_end)
+            cache_key = (date, duration)
+            cached = self._avail_cache.get(cache_key)
+            if cached is not None:
+                self._avail_cache.move_to_end(cache_key)
+                return cached
             
-            while current_time + timedelta(minutes=duration) <= end_time:
-                slot_start = current_time.time()
-                slot_end = (current_time + timedelta(minutes=duration)).time()
-                
-                # Check if this slot conflicts with existing bookings
-                is_available = True
-                for booking in existing_bookings:
-                    booking_start = datetime.strptime(booking["start"], "%H:%M").time()
-                    booking_end = datetime.strptime(booking["end"], "%H:%M").time()
-                    
-                    # Check for overlap
-                    if (slot_start < booking_end and slot_end > booking_start):
-                        is_available = False
-                        break
-                
-                available_slots.append(TimeSlot(
-                    start_time=slot_start.strftime("%H:%M"),
-                    end_time=slot_end.strftime("%H:%M"),
-                    available=is_available
-                ))
-                
-                current_time += timedelta(minutes=self.slot_duration)
+            free_slots = _free_slots(
+                self._slot_starts, self._business_end_min, duration,
+                self.existing_bookings.get(date, [])
+            )
             
-            # Return only available slots
-            return [slot for slot in available_slots if slot.available]
+            # Only the free slots get an end time formatted; the values are
+            # generated here, so Pydantic validation is skipped
+            available_slots = [
+                TimeSlot.model_construct(
+                    start_time=start_str,
+                    end_time=self._fmt(start + duration),
+                    available=True,
+                    start_min=start
+                )
+                for start, start_str in free_slots
+            ]
+            self._avail_cache[cache_key] = available_slots
+            if len(self._avail_cache) > self._max_avail_cache:
+                self._avail_cache.popitem(last=False)
+            return available_slots
             
         except Exception as e:
             logger.error(f"Error getting availability for {date}: {str(e)}")
@@ -92,17 +153,17 @@ class MockCalendarService:
         try:
             # Validate the booking request
             date_obj = datetime.strptime(booking.date, "%Y-%m-%d").date()
-            time_obj = datetime.strptime(booking.time, "%H:%M").time()
+            now = datetime.now()
             
             # Check if the date is in the future
-            if date_obj < datetime.now().date():
+            if date_obj < now.date():
                 return {
                     "success": False,
                     "error": "Cannot book appointments in the past"
                 }
             
             # Check if the time slot is available
-            available_slots = await self.get_availability(booking.date, booking.duration)
+            available_slots = await self.get_availability(booking.date, booking.duration, now)
             requested_slot = next(
                 (slot for slot in available_slots if slot.start_time == booking.time),
                 None
@@ -118,21 +179,19 @@ class MockCalendarService:
             if booking.date not in self.existing_bookings:
                 self.existing_bookings[booking.date] = []
             
-            end_time = (datetime.combine(date_obj, time_obj) + 
-                       timedelta(minutes=booking.duration)).time()
-            
-            self.existing_bookings[booking.date].append({
-                "start": booking.time,
-                "end": end_time.strftime("%H:%M"),
-                "title": booking.title,
-                "description": booking.description
-            })
+            start_min = int(booking.time[:2]) * 60 + int(booking.time[3:])
+            bisect.insort(
+                self.existing_bookings[booking.date],
+                (start_min, start_min + booking.duration, booking.title, booking.description),
+                key=_booking_start
+            )
+            self._version += 1
             
             logger.info(f"Booking confirmed for {booking.date} at {booking.time}")
             
             return {
                 "success": True,
-                "booking_id": f"book_{int(datetime.now().timestamp())}",
+                "booking_id": f"book_{int(now.timestamp())}",
                 "message": f"Appointment booked successfully for {booking.date} at {booking.time}"
             }
             
@@ -153,17 +212,29 @@ class MockCalendarService:
         
         # If no preferred date, suggest next 7 business days
         if not preferred_date:
-            current_date = datetime.now().date()
+            now = datetime.now()
+            current_date = now.date()
+            check_dates = []
             for i in range(1, 15):  # Look ahead 2 weeks
                 check_date = current_date + timedelta(days=i)
                 if check_date.weekday() < 5:  # Skip weekends
-                    date_str = check_date.strftime("%Y-%m-%d")
-                    available_slots = await self.get_availability(date_str, duration)
-                    
+                    check_dates.append(check_date)
+            date_strs = [check_date.strftime("%Y-%m-%d") for check_date in check_dates]
+            
+            # Fetch days in small concurrent batches so remote calendar lookups
+            # overlap, stopping once enough suggestions are found
+            for batch in range(0, len(check_dates), _SUGGESTION_BATCH_DAYS):
+                batch_dates = check_dates[batch:batch + _SUGGESTION_BATCH_DAYS]
+                batch_strs = date_strs[batch:batch + _SUGGESTION_BATCH_DAYS]
+                results = await asyncio.gather(
+                    *(self.get_availability(date_str, duration, now) for date_str in batch_strs)
+                )
+                
+                for check_date, date_str, available_slots in zip(batch_dates, batch_strs, results):
                     if available_slots:
                         # Suggest morning, afternoon, and evening slots if available
-                        morning_slots = [s for s in available_slots if s.start_time < "12:00"]
-                        afternoon_slots = [s for s in available_slots if "12:00" <= s.start_time < "17:00"]
+                        morning_slots = [s for s in available_slots if s.start_min < _NOON_MIN]
+                        afternoon_slots = [s for s in available_slots if _NOON_MIN <= s.start_min < _AFTERNOON_END_MIN]
                         
                         if morning_slots:
                             suggestions.append({
@@ -183,6 +254,9 @@ class MockCalendarService:
                     
                     if len(suggestions) >= 5:  # Limit suggestions
                         break
+                
+                if len(suggestions) >= 5:
+                    break
         else:
             # Get suggestions for specific date
             available_slots = await self.get_availability(preferred_date, duration)
@@ -1,74 +1,108 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
-from .models import ConversationState, BookingRequest
+import re
+from functools import lru_cache
+from time import monotonic
+from .models import ConversationState, BookingRequest, TimeSlot
 from .calendar_service import calendar_service
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
+def _parse_ymd(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD date, memoized across turns"""
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+@lru_cache(maxsize=256)
+def _format_date(date_str: str) -> str:
+    """Format a YYYY-MM-DD date for display, e.g. 'Friday, June 27'"""
+    return _parse_ymd(date_str).strftime("%A, %B %d")
+
+# How long a calendar availability lookup is reused within a booking dialog
+AVAILABILITY_TTL = 30  # seconds
+
 class ConversationGraph:
     """
     Manages conversation flow using a graph-based approach similar to LangGraph
     """
     
+    # Whole-word replies to a confirmation prompt; verbs also match their
+    # inflected forms ("booked", "confirming")
+    _CONFIRM_RE = re.compile(r"\b(?:yes|confirm\w*|book\w*|schedule\w*|ok(?:ay)?|sure|please)\b", re.I)
+    _DECLINE_RE = re.compile(r"\b(?:no(?:pe)?|cancel\w*|different|change\w*)\b", re.I)
+    
     def __init__(self):
-        self.nodes = {
-            "start": self._handle_start,
-            "intent_booking": self._handle_intent_booking,
-            "collect_date": self._handle_collect_date,
-            "collect_time": self._handle_collect_time,
-            "show_availability": self._handle_show_availability,
-            "confirm_booking": self._handle_confirm_booking,
-            "booking_complete": self._handle_booking_complete,
-            "handle_query": self._handle_general_query
+        # intent -> handler; no route depends on the current node yet
+        self._routes = {
+            "book_appointment": self._handle_intent_booking,
+            "check_availability": self._handle_show_availability,
+            "confirm": self._handle_confirm_booking,
+            "decline": self._handle_collect_time,
+        }
+        
+        # (date, duration) -> (fetched_at, slots)
+        self._avail_cache: Dict[Tuple[str, int], Tuple[float, List[TimeSlot]]] = {}
+        
+        # (date, duration) -> calendar lookup in flight, shared by concurrent chats
+        self._avail_inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+    
+    async def _cached_availability(self, date: str, duration: int) -> List[TimeSlot]:
+        """
+        Get availability from the calendar service, reusing a lookup for the
+        same date and duration made within AVAILABILITY_TTL seconds. Concurrent
+        requests for the same key wait on a single calendar call.
+        """
+        key = (date, duration)
+        now = monotonic()
+        entry = self._avail_cache.get(key)
+        if entry is not None and now - entry[0] < AVAILABILITY_TTL:
+            return entry[1]
+        
+        # Drop expired lookups so the cache only spans the last TTL window
+        self._avail_cache = {
+            k: v for k, v in self._avail_cache.items() if now - v[0] < AVAILABILITY_TTL
         }
+        
+        lookup = self._avail_inflight.get(key)
+        if lookup is None:
+            lookup = asyncio.ensure_future(calendar_service.get_availability(date, duration))
+            self._avail_inflight[key] = lookup
+            lookup.add_done_callback(lambda _: self._avail_inflight.pop(key, None))
+        
+        # Shield the shared lookup so one cancelled waiter doesn't cancel it for the rest
+        slots = await asyncio.shield(lookup)
+        self._avail_cache[key] = (monotonic(), slots)
+        return slots
+    
+    def invalidate_availability(self, date: str):
+        """
+        Drop cached availability for a date after a booking on it; bookings
+        affect every duration, so all entries for the date are removed
+        """
+        for key in [key for key in self._avail_cache if key[0] == date]:
+            del self._avail_cache[key]
     
     async def process_node(self, conversation: ConversationState, 
                           user_message: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process the current conversation node and determine next action
         """
-        current_node = conversation.current_node
-        
-        # Route to appropriate handler based on intent and current state
         intent = intent_analysis.get("intent")
         
-        if intent == "book_appointment":
-            if current_node == "start":
-                next_node = "intent_booking"
-            elif current_node in ["collect_date", "collect_time", "show_availability"]:
-                next_node = "intent_booking"
-            else:
-                next_node = "intent_booking"
-        elif intent == "check_availability":
-            next_node = "show_availability"
-        elif intent == "confirm" or (current_node == "confirm_booking" and intent == "book_appointment"):
-            next_node = "confirm_booking"
-        elif intent == "decline":
-            next_node = "collect_time"
-        else:
+        # Route to appropriate handler based on intent
+        handler = self._routes.get(intent)
+        
+        if handler is None:
             # If we have date/time info but general query, treat as booking
             extracted_info = intent_analysis.get("extracted_info", {})
             if extracted_info.get("date") or extracted_info.get("time"):
-                next_node = "intent_booking"
+                handler = self._handle_intent_booking
             else:
-                next_node = "handle_query"
+                handler = self._handle_general_query
         
-        # Execute the node handler
-        if next_node in self.nodes:
-            return await self.nodes[next_node](conversation, user_message, intent_analysis)
-        else:
-            return await self.nodes["handle_query"](conversation, user_message, intent_analysis)
-    
-    async def _handle_start(self, conversation: ConversationState, 
-                           user_message: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Handle initial conversation start
-        """
-        return {
-            "response": "Hello! I'm your AI booking assistant. I can help you schedule appointments, check availability, and manage your calendar. What would you like to do today?",
-            "next_node": "intent_booking"
-        }
+        return await handler(conversation, user_message, intent_analysis)
     
     async def _handle_intent_booking(self, conversation: ConversationState, 
                                    user_message: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,8 +123,7 @@ class ConversationGraph:
         elif not has_time:
             date_str = has_date
             try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%A, %B %d")
+                formatted_date = _format_date(date_str)
             except:
                 formatted_date = date_str
             
@@ -113,8 +146,7 @@ class ConversationGraph:
         if date:
             # Date extracted, move to time collection
             try:
-                date_obj = datetime.strptime(date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%A, %B %d")
+                formatted_date = _format_date(date)
                 
                 return {
                     "response": f"Perfect! I have {formatted_date}. What time would you prefer for your appointment?",
@@ -172,11 +204,15 @@ class ConversationGraph:
             }
         
         try:
+            formatted_date = _format_date(date)
+            
             # Get available slots
-            available_slots = await calendar_service.get_availability(date, duration)
+            available_slots = await self._cached_availability(date, duration)
             
             if not available_slots:
-                # No availability, suggest alternatives
+                # No availability, suggest alternatives. Suggestions scan two
+                # weeks of calendar days, so they're only fetched here, never
+                # speculatively on the common path.
                 suggestions = await calendar_service.get_booking_suggestions(duration=duration)
                 if suggestions:
                     suggestion_text = "\n".join([f"• {s['label']}" for s in suggestions[:3]])
@@ -204,10 +240,8 @@ class ConversationGraph:
                     
                     # Book the appointment
                     result = await calendar_service.book_appointment(booking)
-                    date_obj = datetime.strptime(date, "%Y-%m-%d")
-                    formatted_date = date_obj.strftime("%A, %B %d")
-                    
                     if result["success"]:
+                        self.invalidate_availability(date)
                         return {
                             "response": f"Perfect! I've successfully booked your appointment for {formatted_date} at {time} for {duration} minutes. Your booking is confirmed!",
                             "next_node": "booking_complete",
@@ -234,8 +268,6 @@ class ConversationGraph:
             else:
                 # Show available slots for user to choose
                 slot_text = "\n".join([f"• {slot.start_time} - {slot.end_time}" for slot in available_slots[:5]])
-                date_obj = datetime.strptime(date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%A, %B %d")
                 
                 return {
                     "response": f"Here are the available time slots for {formatted_date}:\n\n{slot_text}\n\nWhich time would you prefer?",
@@ -254,16 +286,14 @@ class ConversationGraph:
         """
         Handle booking confirmation
         """
-        user_response = user_message.lower().strip()
-        
         # Check for confirmation words
-        if any(word in user_response for word in ["yes", "confirm", "book", "schedule", "ok", "sure", "please"]):
+        if self._CONFIRM_RE.search(user_message):
             return {
                 "response": "Perfect! I'm booking your appointment now...",
                 "next_node": "booking_complete",
                 "action": "confirm_booking"
             }
-        elif any(word in user_response for word in ["no", "cancel", "different", "change"]):
+        elif self._DECLINE_RE.search(user_message):
             conversation.pending_confirmation = None
             return {
                 "response": "No problem! Let's find a different time that works better for you. What would you prefer?",
@@ -275,16 +305,6 @@ class ConversationGraph:
                 "next_node": "confirm_booking"
             }
     
-    async def _handle_booking_complete(self, conversation: ConversationState, 
-                                     user_message: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Handle completed booking
-        """
-        return {
-            "response": "Your appointment has been successfully booked! You should receive a confirmation shortly. Is there anything else I can help you with?",
-            "next_node": "start"
-        }
-    
     async def _handle_general_query(self, conversation: ConversationState, 
                                    user_message: str, intent_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1,15 +1,31 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import uvicorn
 from .models import ChatRequest, ChatResponse
 from .agent import BookingAgent
 import logging
+import json
+import hashlib
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Booking Agent API", version="1.0.0")
+# The booking agent is built and warmed up in lifespan, before the app
+# accepts traffic, so the first request doesn't pay the startup cost
+booking_agent: Optional[BookingAgent] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global booking_agent
+    booking_agent = BookingAgent()
+    await booking_agent.warmup()
+    yield
+
+app = FastAPI(title="AI Booking Agent API", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -20,9 +36,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the booking agent
-booking_agent = BookingAgent()
-
 @app.get("/")
 async def root():
     return {"message": "AI Booking Agent API is running"}
@@ -59,14 +72,64 @@ async def chat_endpoint(request: ChatRequest):
             detail=f"Failed to process request: {str(e)}"
         )
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Handle chat requests and stream the response as server-sent events.
+    Text arrives as data frames with a "delta" field, followed by a "done"
+    event carrying the booking metadata, or an "error" event on failure.
+    """
+    async def event_stream():
+        try:
+            logger.info(f"Processing chat stream request: {request.message[:50]}...")
+            
+            result = await booking_agent.process_message(
+                message=request.message,
+                conversation_id=request.conversation_id
+            )
+        except Exception as e:
+            logger.error(f"Error processing chat stream request: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+            return
+        
+        for chunk in result["response"].splitlines(keepends=True):
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        
+        metadata = {
+            "booking_confirmed": result.get("booking_confirmed", False),
+            "booking_details": result.get("booking_details", {}),
+            "conversation_id": request.conversation_id
+        }
+        yield f"event: done\ndata: {json.dumps(metadata)}\n\n"
+    
+    # Keep proxies in front of the backend (e.g. Render's) from buffering
+    # the stream, which would hold every frame back until the response ends
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/availability/{date}")
-async def get_availability(date: str):
+async def get_availability(date: str, if_none_match: Optional[str] = Header(default=None)):
     """
-    Get available time slots for a specific date
+    Get available time slots for a specific date. The response carries an
+    ETag of the slot list, so clients (and any CDN in front) can revalidate
+    with If-None-Match and get a 304 while availability is unchanged.
     """
     try:
         availability = await booking_agent.get_availability(date)
-        return {"date": date, "available_slots": availability}
+        body = json.dumps({"date": date, "available_slots": availability}, separators=(",", ":"))
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=30"}
+        
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        ):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error getting availability: {str(e)}")
         raise HTTPException(
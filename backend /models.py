@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from dataclasses import dataclass, field
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="User message")
@@ -23,13 +24,16 @@ class TimeSlot(BaseModel):
     start_time: str = Field(..., description="Start time in HH:MM format")
     end_time: str = Field(..., description="End time in HH:MM format")
     available: bool = Field(..., description="Whether the slot is available")
+    start_min: int = Field(..., description="Start time in minutes after midnight")
 
-class ConversationState(BaseModel):
+@dataclass(slots=True)
+class ConversationState:
+    """Internal per-conversation state; never crosses the HTTP boundary"""
     conversation_id: str
     current_node: str = "start"
     user_intent: Optional[str] = None
-    extracted_info: Dict[str, Any] = Field(default_factory=dict)
+    extracted_info: Dict[str, Any] = field(default_factory=dict)
     pending_confirmation: Optional[BookingRequest] = None
     last_response: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
@@ -1,7 +1,72 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional, Tuple
 import re
 
+# Relative day keywords (group 1) and weekday names (group 2), matched in a
+# single scan. Weekdays must be spelled out, since abbreviations like "mon",
+# "wed" and "sun" also occur as ordinary words ("c'mon").
+_RELATIVE_DATE_RE = re.compile(
+    r"\b(?:(today|tomorrow|yesterday|next week|this week)"
+    r"|(mon|tues|wednes|thurs|fri|satur|sun)days?)\b"
+)
+_KEYWORD_PRIORITY = {"today": 0, "tomorrow": 1, "yesterday": 2, "next week": 3, "this week": 4}
+_WEEKDAY_INDEX = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+def _relative_date_rank(match: re.Match) -> int:
+    """Keywords win over weekdays, and earlier weekdays over later ones"""
+    if match.group(1):
+        return _KEYWORD_PRIORITY[match.group(1)]
+    return len(_KEYWORD_PRIORITY) + _WEEKDAY_INDEX[match.group(2)[:3]]
+
+# Specific date patterns
+_DATE_PATTERNS = [
+    re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})"),  # MM/DD/YYYY or DD/MM/YYYY
+    re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"),  # YYYY-MM-DD
+]
+
+# Direct time patterns
+_TIME_PATTERNS = [
+    re.compile(r"(\d{1,2}):(\d{2})\s*([ap]m)?"),  # 2:30 PM, 14:30
+    re.compile(r"(\d{1,2})\s*([ap]m)"),  # 2 PM, 2PM, 9am
+    re.compile(r"(\d{1,2})\.(\d{2})"),  # 2.30
+]
+_HOUR_AM_PM_PATTERN = _TIME_PATTERNS[1]
+
+# Relative time expressions, in order of precedence
+_TIME_MAPPINGS = {
+    "morning": "09:00",
+    "afternoon": "14:00",
+    "evening": "18:00",
+    "noon": "12:00",
+    "midnight": "00:00"
+}
+_TIME_KEYWORD_RANK = {keyword: i for i, keyword in enumerate(_TIME_MAPPINGS)}
+_TIME_KEYWORD_RE = re.compile(r"\b(" + "|".join(_TIME_MAPPINGS) + r")")
+
+_PREFERENCE_RANGES = {
+    "morning": ("09:00", "12:00"),
+    "afternoon": ("12:00", "17:00"),
+    "evening": ("17:00", "20:00"),
+    "late morning": ("10:00", "12:00"),
+    "early afternoon": ("12:00", "15:00"),
+    "late afternoon": ("15:00", "17:00")
+}
+_BUSINESS_HOURS_RANGE = ("09:00", "17:00")
+
+# YYYY-MM-DD with the same leniency as strptime("%Y-%m-%d"): month and day
+# may be one or two digits
+_YMD_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+def _parse_ymd(date_str: str) -> date:
+    """Parse a YYYY-MM-DD date, raising ValueError on anything else"""
+    match = _YMD_RE.fullmatch(date_str)
+    if not match:
+        raise ValueError(f"invalid date: {date_str!r}")
+    return date(*map(int, match.groups()))
+
+# Days to the next business day, by weekday; anything not listed is 1
+_NEXT_BUSINESS_DAY_JUMP = {4: 3, 5: 2}  # Friday, Saturday -> Monday
+
 def parse_relative_date(text: str, base_date: Optional[datetime] = None) -> Optional[str]:
     """
     Parse relative date expressions like 'tomorrow', 'next week', etc.
@@ -12,39 +77,35 @@ def parse_relative_date(text: str, base_date: Optional[datetime] = None) -> Opti
     
     text = text.lower().strip()
     
+    relative = min(_RELATIVE_DATE_RE.finditer(text), key=_relative_date_rank, default=None)
+    keyword = relative.group(1) if relative else None
+    
     # Today/tomorrow/yesterday
-    if "today" in text:
+    if keyword == "today":
         return base_date.strftime("%Y-%m-%d")
-    elif "tomorrow" in text:
+    elif keyword == "tomorrow":
         return (base_date + timedelta(days=1)).strftime("%Y-%m-%d")
-    elif "yesterday" in text:
+    elif keyword == "yesterday":
         return (base_date - timedelta(days=1)).strftime("%Y-%m-%d")
     
     # Next week/this week
-    elif "next week" in text:
+    elif keyword == "next week":
         days_ahead = 7 - base_date.weekday()  # Days to next Monday
         return (base_date + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
-    elif "this week" in text:
+    elif keyword == "this week":
         days_ahead = 1 if base_date.weekday() == 6 else 0  # If Sunday, go to Monday
         return (base_date + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
     
     # Specific weekdays
-    weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-    for i, day in enumerate(weekdays):
-        if day in text:
-            days_ahead = i - base_date.weekday()
-            if days_ahead <= 0:  # Target day already happened this week
-                days_ahead += 7
-            return (base_date + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+    elif relative:
+        days_ahead = _WEEKDAY_INDEX[relative.group(2)[:3]] - base_date.weekday()
+        if days_ahead <= 0:  # Target day already happened this week
+            days_ahead += 7
+        return (base_date + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
     
     # Try to parse specific dates (e.g., "June 28", "6/28", "28/6")
-    date_patterns = [
-        r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})",  # MM/DD/YYYY or DD/MM/YYYY
-        r"(\d{4})-(\d{1,2})-(\d{1,2})",  # YYYY-MM-DD
-    ]
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 parts = match.groups()
@@ -69,20 +130,13 @@ def parse_time_expression(text: str) -> Optional[str]:
     """
     text = text.lower().strip()
     
-    # Direct time patterns
-    time_patterns = [
-        r"(\d{1,2}):(\d{2})\s*([ap]m)?",  # 2:30 PM, 14:30
-        r"(\d{1,2})\s*([ap]m)",  # 2 PM, 2PM, 9am
-        r"(\d{1,2})\.(\d{2})",  # 2.30
-    ]
-    
-    for pattern in time_patterns:
-        match = re.search(pattern, text)
+    for pattern in _TIME_PATTERNS:
+        match = pattern.search(text)
         if match:
             hour = int(match.group(1))
             
             # Handle different group structures
-            if pattern == r"(\d{1,2})\s*([ap]m)":
+            if pattern is _HOUR_AM_PM_PATTERN:
                 minute = 0
                 am_pm = match.group(2).lower() if len(match.groups()) > 1 else None
             else:
@@ -101,17 +155,13 @@ def parse_time_expression(text: str) -> Optional[str]:
                 return f"{hour:02d}:{minute:02d}"
     
     # Relative time expressions
-    time_mappings = {
-        "morning": "09:00",
-        "afternoon": "14:00",
-        "evening": "18:00",
-        "noon": "12:00",
-        "midnight": "00:00"
-    }
-    
-    for keyword, time_str in time_mappings.items():
-        if keyword in text:
-            return time_str
+    keyword = min(
+        (match.group(1) for match in _TIME_KEYWORD_RE.finditer(text)),
+        key=_TIME_KEYWORD_RANK.__getitem__,
+        default=None
+    )
+    if keyword:
+        return _TIME_MAPPINGS[keyword]
     
     return None
 
@@ -120,16 +170,7 @@ def get_time_preference_range(preference: str) -> Tuple[str, str]:
     Get time range for preferences like 'morning', 'afternoon'
     Returns (start_time, end_time) in HH:MM format
     """
-    ranges = {
-        "morning": ("09:00", "12:00"),
-        "afternoon": ("12:00", "17:00"),
-        "evening": ("17:00", "20:00"),
-        "late morning": ("10:00", "12:00"),
-        "early afternoon": ("12:00", "15:00"),
-        "late afternoon": ("15:00", "17:00")
-    }
-    
-    return ranges.get(preference.lower(), ("09:00", "17:00"))
+    return _PREFERENCE_RANGES.get(preference.lower(), _BUSINESS_HOURS_RANGE)
 
 def format_duration(minutes: int) -> str:
     """
@@ -150,8 +191,7 @@ def is_business_day(date_str: str) -> bool:
     Check if a date is a business day (Monday-Friday)
     """
     try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        return date_obj.weekday() < 5  # 0-4 are Monday-Friday
+        return _parse_ymd(date_str).weekday() < 5  # 0-4 are Monday-Friday
     except ValueError:
         return False
 
@@ -160,10 +200,8 @@ def get_next_business_day(date_str: str) -> str:
     Get the next business day after the given date
     """
     try:
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        while True:
-            date_obj += timedelta(days=1)
-            if date_obj.weekday() < 5:  # Monday-Friday
-                return date_obj.strftime("%Y-%m-%d")
+        date_obj = _parse_ymd(date_str)
+        jump = _NEXT_BUSINESS_DAY_JUMP.get(date_obj.weekday(), 1)
+        return (date_obj + timedelta(days=jump)).isoformat()
     except ValueError:
-        return datetime.now().strftime("%Y-%m-%d")
+        return date.today().isoformat()